@@ -0,0 +1,224 @@
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+_untraced_span = nullcontext()
+
+
+def untraced(phase: str):
+    """A stand in for Tracer.span when tracing is disabled, costing a single call.
+
+    Args:
+        phase: the phase that would have been traced.
+
+    Returns:
+        A reusable context manager that does nothing.
+    """
+    return _untraced_span
+
+
+class PuzzleTrace:
+    """The phases and search tree shape recorded while solving a single puzzle.
+
+    Attributes:
+        name (str): a friendly name for the puzzle.
+        start (float): when the puzzle was started, in seconds from the start of the trace.
+        duration (float): the time spent on the puzzle, in seconds.
+        spans (list of (str, float, float)): each phase, when it started and its duration, in seconds.
+        depths (Counter of int: int): the number of search nodes visited at each depth of the DLX search.
+    """
+    def __init__(self, name: str, start: float):
+        """Initializer.
+
+        Args:
+            name: a friendly name for the puzzle.
+            start: when the puzzle was started, in seconds from the start of the trace.
+        """
+        self.name = name
+        self.start = start
+        self.duration = 0.0
+        self.spans: List[Tuple[str, float, float]] = []
+        self.depths: Counter = Counter()
+
+
+class Tracer:
+    """An opt-in recorder of where the time goes when solving a batch of puzzles.
+
+    Each puzzle is traced in phases, e.g. 'parse', 'build', 'givens', 'search' and 'materialize', along with
+    a histogram of the DLX search depths. The traces can be summarised over the batch, or exported as
+    Chrome trace JSON to view in chrome://tracing or Perfetto.
+
+    Attributes:
+        puzzles (list of PuzzleTrace): the trace of each puzzle, in the order they were solved.
+    """
+    def __init__(self):
+        super().__init__()
+
+        self.puzzles: List[PuzzleTrace] = []
+        self._origin = time.perf_counter()
+        self._current: Optional[PuzzleTrace] = None
+
+    @property
+    def current(self) -> PuzzleTrace:
+        """The trace of the puzzle() block being run.
+
+        Raises:
+            RuntimeError: if not inside a puzzle() block.
+        """
+        if self._current is None:
+            raise RuntimeError('no puzzle is being traced, trace phases inside Tracer.puzzle()')
+        return self._current
+
+    def _start_puzzle(self, name: str) -> PuzzleTrace:
+        """Adds the trace for a new puzzle."""
+        trace = PuzzleTrace(name or f'puzzle {len(self.puzzles) + 1}', time.perf_counter() - self._origin)
+        self.puzzles.append(trace)
+        return trace
+
+    @contextmanager
+    def puzzle(self, name: str = ''):
+        """Traces the phases of a single puzzle, including any that happen before a solver is created, e.g. 'parse'.
+
+        Args:
+            name: a friendly name for the puzzle.
+
+        Returns:
+            A context manager for the puzzle, yielding its PuzzleTrace.
+        """
+        trace = self._start_puzzle(name)
+        self._current = trace
+        try:
+            yield trace
+        finally:
+            trace.duration = max(trace.duration, time.perf_counter() - self._origin - trace.start)
+            self._current = None
+
+    def begin_solve(self) -> PuzzleTrace:
+        """Called by a solver as it starts, to find the trace it records its phases in.
+
+        The solver keeps the trace, so its later phases, e.g. 'search', go to it even when other solvers
+        have started since, or its puzzle() block has ended.
+
+        Returns:
+            The trace of the current puzzle() block, or a new trace for the solver outside of one.
+        """
+        return self._current if self._current is not None else self._start_puzzle('')
+
+    @contextmanager
+    def span(self, phase: str, trace: Optional[PuzzleTrace] = None):
+        """Records the time spent in a phase of a puzzle.
+
+        Args:
+            phase: the name of the phase, e.g. 'parse'.
+            trace: the trace of the puzzle, the current puzzle() block if None.
+
+        Returns:
+            A context manager for the phase.
+        """
+        trace = trace or self.current
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            trace.spans.append((phase, start - self._origin, end - start))
+            # a puzzle lasts at least until its last phase, which for a solver may be after its puzzle() block
+            trace.duration = max(trace.duration, end - self._origin - trace.start)
+
+    def timed(self, items: Iterable[Any], phase: str, trace: Optional[PuzzleTrace] = None) -> Iterator[Any]:
+        """Records the time spent producing each item of an iterable as a phase, e.g. each DLX search result.
+
+        Args:
+            items: the iterable to time.
+            phase: the name of the phase.
+            trace: the trace of the puzzle, the current puzzle() block if None.
+
+        Returns:
+            The items.
+        """
+        trace = trace or self.current
+        iterator = iter(items)
+        try:
+            while True:
+                with self.span(phase, trace):
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                yield item
+        finally:
+            # closing the timed items closes the items too, e.g. to put back a DLX search stopped early
+            if hasattr(iterator, 'close'):
+                iterator.close()
+
+    def count_node(self, depth: int, trace: Optional[PuzzleTrace] = None):
+        """Records a DLX search node visited in a puzzle.
+
+        Args:
+            depth: the depth of the node in the search tree.
+            trace: the trace of the puzzle, the current puzzle() block if None.
+        """
+        (trace or self.current).depths[depth] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregates the traces of all the puzzles.
+
+        Returns:
+            The number of puzzles, the count, total, mean and max seconds of each phase, and the number
+            of search nodes visited at each depth over all the puzzles.
+        """
+        phases: Dict[str, Dict[str, float]] = {}
+        depths: Counter = Counter()
+        for trace in self.puzzles:
+            # a phase may be split over several spans of a puzzle, e.g. search, so total them per puzzle first
+            totals: Counter = Counter()
+            for phase, _, duration in trace.spans:
+                totals[phase] += duration
+            for phase, total in totals.items():
+                stats = phases.setdefault(phase, {'count': 0, 'total': 0.0, 'max': 0.0})
+                stats['count'] += 1
+                stats['total'] += total
+                stats['max'] = max(stats['max'], total)
+            depths.update(trace.depths)
+
+        for stats in phases.values():
+            stats['mean'] = stats['total'] / stats['count']
+
+        return {'puzzles': len(self.puzzles),
+                'phases': phases,
+                'depths': dict(sorted(depths.items()))}
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Exports the traces in the Chrome trace event format.
+
+        Each puzzle and each phase is a complete ('X') event, in microseconds, and the search depth histogram
+        of a puzzle is in the args of its event. The batch summary is in 'otherData'.
+
+        Returns:
+            The trace, ready to be serialised as JSON.
+        """
+        pid = os.getpid()
+        events = []
+        for trace in self.puzzles:
+            events.append({'name': trace.name, 'cat': 'puzzle', 'ph': 'X', 'pid': pid, 'tid': 1,
+                           'ts': trace.start * 1e6, 'dur': trace.duration * 1e6,
+                           'args': {'nodes': sum(trace.depths.values()),
+                                    'depths': {str(d): n for d, n in sorted(trace.depths.items())}}})
+            for phase, start, duration in trace.spans:
+                events.append({'name': phase, 'cat': 'phase', 'ph': 'X', 'pid': pid, 'tid': 1,
+                               'ts': start * 1e6, 'dur': duration * 1e6, 'args': {'puzzle': trace.name}})
+
+        summary = self.summary()
+        summary['depths'] = {str(d): n for d, n in summary['depths'].items()}
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': summary}
+
+    def write_chrome_trace(self, f: TextIO):
+        """Writes the traces as Chrome trace JSON.
+
+        Args:
+            f: the text file to write to.
+        """
+        json.dump(self.chrome_trace(), f)
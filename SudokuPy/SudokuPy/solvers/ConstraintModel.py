@@ -0,0 +1,250 @@
+from functools import lru_cache
+from itertools import product
+import math
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Sequence, Set, Tuple
+
+from SudokuPy.Puzzle import cross
+
+# A DLX column is a constraint family name and a pair of indices, e.g. ('row', (3, 7)) for "row 3 holds a 7".
+Column = Tuple[str, Tuple[int, int]]
+# A DLX row is a square and a digit, e.g. ('r3c2', '7').
+Row = Tuple[str, str]
+
+
+class CompiledModel:
+    """The DLX matrix for a constraint model, built once and shared by every puzzle of the variant.
+
+    Everything here is shared, so it is frozen, or must be treated as read only.
+
+    Attributes:
+        rows (mapping of Row: tuple of Column): the DLX row headers, a read only view.
+        columns (dict of Column: frozenset of Row): the DLX nodes for each column, copied for each puzzle.
+        secondary (frozenset of Column): the columns that may be covered at most once, rather than exactly once.
+        unit_list (list of list of str): every primary region, i.e. each unit that must hold all of the digits.
+        units (dict of str: list of list of str): the units of each square.
+        peers (dict of str: set of str): every square in a unit with a square (without the square itself).
+    """
+    def __init__(self,
+                 rows: Mapping[Row, Tuple[Column, ...]],
+                 columns: Dict[Column, FrozenSet[Row]],
+                 secondary: FrozenSet[Column],
+                 unit_list: List[List[str]],
+                 units: Dict[str, List[List[str]]],
+                 peers: Dict[str, Set[str]]):
+        """Initializer.
+
+        Args:
+            rows: the DLX row headers.
+            columns: the DLX nodes for each column.
+            secondary: the secondary columns.
+            unit_list: every primary region.
+            units: the units of each square.
+            peers: the peers of each square.
+        """
+        self.rows = rows
+        self.columns = columns
+        self.secondary = secondary
+        self.unit_list = unit_list
+        self.units = units
+        self.peers = peers
+
+    def new_columns(self) -> Dict[Column, set]:
+        """Creates a fresh, mutable set of DLX nodes for solving one puzzle.
+
+        Returns:
+            The DLX nodes, ready to be covered and uncovered.
+        """
+        return {c: set(rs) for c, rs in self.columns.items()}
+
+
+@lru_cache(maxsize=64)
+def _compile(key: Tuple) -> CompiledModel:
+    """Builds the DLX matrix for a model's key.
+
+    The most recently used matrices are cached, so each variant is only built once, while the
+    cache stays bounded however many jigsaw layouts are seen.
+
+    Args:
+        key: the cache key of a ConstraintModel, its size and primary and secondary region families.
+
+    Returns:
+        The compiled DLX matrix.
+    """
+    size, regions, secondary_regions = key
+    digits = range(1, size + 1)
+    rows = {}
+    for r, c, n in product(digits, digits, digits):
+        rows[(f'r{r}c{c}', f'{n}')] = [('cell', (r, c))]
+
+    secondary = set()
+    for families, is_secondary in ((regions, False), (secondary_regions, True)):
+        for family, family_regions in families:
+            for i, region in enumerate(family_regions, 1):
+                for s, n in product(region, digits):
+                    column = (family, (i, n))
+                    rows[(s, f'{n}')].append(column)
+                    if is_secondary:
+                        secondary.add(column)
+
+    columns = {}
+    for i, row in rows.items():
+        for j in row:
+            columns.setdefault(j, set()).add(i)
+
+    unit_list = [list(region) for _, family_regions in regions for region in family_regions]
+    squares = [f'r{r}c{c}' for r, c in product(digits, digits)]
+    units = dict((s, [u for u in unit_list if s in u]) for s in squares)
+    peers = dict((s, set(sum(units[s], [])) - {s}) for s in squares)
+
+    return CompiledModel(MappingProxyType({i: tuple(row) for i, row in rows.items()}),
+                         {j: frozenset(rs) for j, rs in columns.items()},
+                         frozenset(secondary),
+                         unit_list, units, peers)
+
+
+class ConstraintModel:
+    """A declarative definition of a sudoku variant.
+
+    Every variant has the cell constraint (each square holds exactly one digit), plus a list of named
+    region families. Each region of a primary family must hold every digit exactly once, and each
+    region of a secondary family may hold each digit at most once.
+
+    Attributes:
+        name (str): a friendly name for the variant, e.g. 'diagonal'.
+        size (int): the number of digits, rows and columns.
+        regions (list of (str, list of list of str)): the primary region families, by name.
+        secondary_regions (list of (str, list of list of str)): the secondary region families, by name.
+        key (tuple): the cache key of the model, two models with the same key compile to the same matrix.
+    """
+    def __init__(self,
+                 name: str,
+                 size: int,
+                 regions: Sequence[Tuple[str, Sequence[Sequence[str]]]],
+                 secondary_regions: Sequence[Tuple[str, Sequence[Sequence[str]]]] = ()):
+        """Initializer.
+
+        Args:
+            name: a friendly name for the variant.
+            size: the number of digits, rows and columns.
+            regions: the primary region families, e.g. [('row', [['r1c1', ... 'r1c9'], ...]), ...].
+            secondary_regions: the secondary region families.
+        """
+        super().__init__()
+
+        self.name = name
+        self.size = size
+        self.regions = [(family, [list(region) for region in family_regions])
+                        for family, family_regions in regions]
+        self.secondary_regions = [(family, [list(region) for region in family_regions])
+                                  for family, family_regions in secondary_regions]
+
+        for family, family_regions in self.regions:
+            for region in family_regions:
+                if len(region) != size:
+                    raise ValueError(f'{name}: {family} region {region} must have {size} squares')
+
+        self.key = (size,
+                    tuple((f, tuple(tuple(r) for r in rs)) for f, rs in self.regions),
+                    tuple((f, tuple(tuple(r) for r in rs)) for f, rs in self.secondary_regions))
+
+    @property
+    def unit_list(self) -> List[List[str]]:
+        """Every primary region, i.e. each unit that must hold all of the digits."""
+        return [region for _, family_regions in self.regions for region in family_regions]
+
+    def compile(self) -> CompiledModel:
+        """Compiles the model into DLX rows and columns.
+
+        The result is cached by the model's key, so the matrix for a variant is only built once
+        (while it stays among the most recently used).
+
+        Returns:
+            The compiled DLX matrix.
+        """
+        return _compile(self.key)
+
+
+def _squares(size: int) -> Tuple[List[str], List[str]]:
+    """The row and column indices for a puzzle size, as used by Puzzle."""
+    digits = range(1, size + 1)
+    return [f'r{d}' for d in digits], [f'c{d}' for d in digits]
+
+
+def _lines(size: int) -> List[Tuple[str, List[List[str]]]]:
+    """The row and column region families for a puzzle size."""
+    rows, cols = _squares(size)
+    return [('row', [cross([r], cols) for r in rows]),
+            ('column', [cross(rows, [c]) for c in cols])]
+
+
+def _boxes(size: int, offset: int = 0, step: int = 0) -> List[List[str]]:
+    """The square boxes of a puzzle, optionally offset and spaced out (as in windoku)."""
+    box_size = int(math.sqrt(size))
+    rows, cols = _squares(size)
+    step = step or box_size
+    starts = range(offset, size - box_size + 1, step)
+    return [cross(rows[r:r + box_size], cols[c:c + box_size]) for r in starts for c in starts]
+
+
+def standard_model(size: int = 9) -> ConstraintModel:
+    """The classic sudoku: rows, columns and boxes.
+
+    Args:
+        size: the number of digits, rows and columns.
+
+    Returns:
+        The constraint model.
+    """
+    return ConstraintModel('standard', size, _lines(size) + [('box', _boxes(size))])
+
+
+def diagonal_model(size: int = 9) -> ConstraintModel:
+    """Sudoku X: the standard constraints, plus both main diagonals must hold all the digits.
+
+    Args:
+        size: the number of digits, rows and columns.
+
+    Returns:
+        The constraint model.
+    """
+    rows, cols = _squares(size)
+    diagonals = [[r + c for r, c in zip(rows, cols)],
+                 [r + c for r, c in zip(rows, reversed(cols))]]
+    return ConstraintModel('diagonal', size, _lines(size) + [('box', _boxes(size)), ('diagonal', diagonals)])
+
+
+def windoku_model(size: int = 9) -> ConstraintModel:
+    """Windoku: the standard constraints, plus the extra 'window' boxes offset by one square from the corners.
+
+    Args:
+        size: the number of digits, rows and columns.
+
+    Returns:
+        The constraint model.
+    """
+    box_size = int(math.sqrt(size))
+    windows = _boxes(size, offset=1, step=box_size + 1)
+    return ConstraintModel('windoku', size, _lines(size) + [('box', _boxes(size)), ('window', windows)])
+
+
+def jigsaw_model(layout: Iterable[str]) -> ConstraintModel:
+    """Jigsaw sudoku: rows and columns, with irregular regions in place of boxes.
+
+    Args:
+        layout (str or list of str): a region label for each square, row by row, e.g. '111222333...'.
+
+    Returns:
+        The constraint model.
+    """
+    labels = [label for line in layout for label in line if not label.isspace()]
+    size = int(math.sqrt(len(labels)))
+    if size * size != len(labels):
+        raise ValueError(f'jigsaw layout must be square, got {len(labels)} labels')
+
+    rows, cols = _squares(size)
+    regions: Dict[str, List[str]] = {}
+    for s, label in zip(cross(rows, cols), labels):
+        regions.setdefault(label, []).append(s)
+
+    return ConstraintModel('jigsaw', size, _lines(size) + [('region', list(regions.values()))])
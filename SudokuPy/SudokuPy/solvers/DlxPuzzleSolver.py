@@ -1,9 +1,15 @@
-from itertools import product
-import math
-from typing import Dict, List, Tuple, Union
+from functools import partial
+import io
+import time
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 
 from SudokuPy.Puzzle import Puzzle
+from SudokuPy.solvers.ConstraintModel import ConstraintModel, standard_model
+from SudokuPy.solvers.EnumerationStats import EnumerationStats, peak_rss
 from SudokuPy.solvers.PuzzleSolver import PuzzleSolver
+from SudokuPy.Tracer import Tracer, untraced
+
+_default_model = standard_model()
 
 
 class DlxPuzzleSolver(PuzzleSolver):
@@ -11,46 +17,52 @@ class DlxPuzzleSolver(PuzzleSolver):
     DLX support - inspired by Ali Assaf's Algorithm X in 30 lines! [1]
     [1]: URL https://www.cs.mcgill.ca/~aassaf9/python/algorithm_x.html
     """
-    def __init__(self, p: Puzzle):
+    def __init__(self, p: Puzzle, model: Optional[ConstraintModel] = None, tracer: Optional[Tracer] = None):
         """Initializer.
 
-        Sets up the DLX constraints
-        there are constraints that:
-        - in each cell must be exactly one number
-        - in each row must be all numbers
-        - in each column must be all numbers
-        - in each box must be all numbers
+        Sets up the DLX constraints from a constraint model: each cell must hold exactly one number, and
+        each region of the model, e.g. a row, column or box, must hold all the numbers.
+        The units and peers of the solver come from the model's regions too.
+
+        The DLX matrix is compiled once per model and cached, so only the column node sets are copied here.
 
         Args:
             p (Puzzle): the Puzzle to be solved.
+            model (ConstraintModel): the sudoku variant to solve, standard sudoku (rows, columns and boxes) if None.
+            tracer (Tracer): records the solver phases and search depths, None (the default) to not trace.
+                They go to the trace of the current Tracer.puzzle() block, or a new trace of the solver's own.
         """
-        super().__init__(p)
-
-        self.x = {c: set() for c in product(
-            ['cell', 'row', 'column', 'box'],
-            [v for v in product(range(1, self.puzzle.size + 1), range(1, self.puzzle.size + 1))])}
-
-        box_size = int(math.sqrt(self.puzzle.size))
-        self.y = {}
-        for r, c, n in product(range(1, self.puzzle.size + 1),
-                               range(1, self.puzzle.size + 1),
-                               range(1, self.puzzle.size + 1)):
-            b = ((r - 1) // box_size) * box_size + ((c - 1) // box_size) + 1
-            self.y[(f'r{r}c{c}', f'{n}')] = [
-                ("cell", (r, c)),
-                ("row", (r, n)),
-                ("column", (c, n)),
-                ("box", (b, n))]
-
-        for i, row in self.y.items():
-            for j in row:
-                self.x[j].add(i)
+        self.tracer = tracer
+        self.trace = None
+        span = untraced
+        if tracer is not None:
+            # keep our own trace, as other solvers may be traced before this one is solved
+            self.trace = tracer.begin_solve()
+            span = partial(tracer.span, trace=self.trace)
+            # shadow the search with a version that counts nodes, so untraced searches pay nothing for it
+            self.recursive_solve = self._traced_recursive_solve
+
+        with span('build'):
+            if model is None:
+                model = _default_model if p.size == _default_model.size else standard_model(p.size)
+            compiled = model.compile()
+            if model is _default_model:
+                super().__init__(p)
+            else:
+                # the units and peers of a variant are worked out once, with its matrix
+                super().__init__(p, compiled.unit_list, compiled.units, compiled.peers)
+
+            self.model = model
+            self.x = compiled.new_columns()
+            self.y = compiled.rows
+            self.secondary = compiled.secondary
 
         # load grid
-        for i in self.puzzle.grid:
-            v = self.puzzle.grid[i]
-            if v:
-                self.cover(self.x, self.y, (i, v))
+        with span('givens'):
+            for i in self.puzzle.grid:
+                v = self.puzzle.grid[i]
+                if v:
+                    self.cover(self.x, self.y, (i, v))
 
     def solve(self) -> Union[Puzzle, None]:
         """Main entry point for using DLX to solve a sudoku.
@@ -60,30 +72,114 @@ class DlxPuzzleSolver(PuzzleSolver):
         Returns:
             One or more solutions in a Puzzle
         """
+        solutions = self.recursive_solve(self.x, self.y, [])
+        span = untraced
+        if self.tracer is not None:
+            solutions = self.tracer.timed(solutions, 'search', self.trace)
+            span = partial(self.tracer.span, trace=self.trace)
+
         solution_count = 0
-        for solution in self.recursive_solve(self.x, self.y, []):
+        for solution in solutions:
             solution_count += 1
             if solution_count > 2:
+                # put the matrix back, rather than waiting for the search to be garbage collected
+                solutions.close()
                 return
             # solution is a partial puzzle grid with only the name value pairs for the unknown cells
 
-            # create a result that is a copy of the original puzzle
-            result = Puzzle()
-            for k, v in self.puzzle.grid.items():
-                result.grid[k] = v
+            with span('materialize'):
+                # create a result that is a copy of the original puzzle
+                result = Puzzle()
+                for k, v in self.puzzle.grid.items():
+                    result.grid[k] = v
 
-            # then add the solution to it
-            for (i, n) in solution:
-                result.grid[i] = n
+                # then add the solution to it
+                for (i, n) in solution:
+                    result.grid[i] = n
 
             yield result
 
+    def enumerate_solutions(self,
+                            sink: Union[Callable[[List[bytes]], Any], BinaryIO],
+                            batch_size: int = 4096,
+                            diff: bool = False,
+                            limit: Optional[int] = None) -> EnumerationStats:
+        """Streams every solution of the puzzle to a file or callback, in bounded batches.
+
+        Unlike solve, no Puzzle is built for a solution and solutions are never held beyond the current batch,
+        so puzzles with millions of solutions can be enumerated in constant memory.
+
+        Each solution is a compact record: either the whole grid as one byte per square (81 bytes for a 9x9),
+        or with diff, only the values of the squares not given, in square order.
+
+        With a tracer, the whole enumeration, including writing the records, is traced as a single 'search'
+        span, so the trace stays the same size however many solutions there are.
+
+        Args:
+            sink: a callable given each batch as a list of records, or a binary file (not a text file) that
+                each record is written to as a line.
+            batch_size: the most records held before they are passed to the sink.
+            diff: write only the values of the squares that were not given.
+            limit: stop after this many solutions, None for all of them.
+
+        Returns:
+            The number of solutions, the time taken and the peak RSS of the process.
+
+        Raises:
+            TypeError: if sink is a text file.
+        """
+        if isinstance(sink, io.TextIOBase):
+            raise TypeError('enumerate_solutions needs a binary file, open it with mode \'wb\'')
+        if hasattr(sink, 'write'):
+            def flush(records):
+                sink.write(b'\n'.join(records) + b'\n')
+        else:
+            flush = sink
+
+        # squares are written either all in order, or only the ones not given, in order
+        squares = [s for s in self.puzzle.squares if not diff or not self.puzzle.grid[s]]
+        index = {s: i for i, s in enumerate(squares)}
+        positions = {(s, n): (index[s], ord(n)) for (s, n) in self.y if s in index}
+        template = bytearray(b'.' * len(squares) if diff
+                             else ''.join(self.puzzle.grid[s] or '.' for s in squares).encode())
+
+        start = time.perf_counter()
+        count = 0
+        if limit is not None and limit <= 0:
+            return EnumerationStats(count, time.perf_counter() - start, peak_rss())
+
+        span = partial(self.tracer.span, trace=self.trace) if self.tracer is not None else untraced
+        with span('search'):
+            batch = []
+            solutions = self.recursive_solve(self.x, self.y, [])
+            for solution in solutions:
+                record = bytearray(template)
+                for r in solution:
+                    i, b = positions[r]
+                    record[i] = b
+                batch.append(bytes(record))
+                count += 1
+
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+                if limit is not None and count >= limit:
+                    break
+            # put the matrix back if the search stopped early
+            solutions.close()
+            if batch:
+                flush(batch)
+
+        return EnumerationStats(count, time.perf_counter() - start, peak_rss())
+
     def recursive_solve(self,
                         x: Dict[Tuple[str, Tuple[int, int]], set],
                         y: Dict[Tuple[str, str], List[Tuple[str, Tuple[int, int]]]],
                         solutions: List[Tuple[str, str]]) -> Union[List[Tuple[str, str]], None]:
         """ Implements the DLX solution algorithm
 
+        Closing the generator before it is exhausted restores x, so the solver can be used again.
+
         Args:
             x: The DLX nodes
             y: The DLX row headers
@@ -92,19 +188,42 @@ class DlxPuzzleSolver(PuzzleSolver):
         Returns:
             Solutions from deeper recursion
         """
-        if not x:
+        # find smallest collection in x
+        if self.secondary:
+            # secondary columns never have to be covered, so only primary columns are searched
+            c = min((j for j in x if j not in self.secondary), key=lambda i: len(x[i]), default=None)
+        else:
+            c = min(x, key=lambda i: len(x[i]), default=None)
+        if c is None:
             yield list(solutions)
         else:
-            # find smallest collection in x
-            c = min(x, key=lambda i: len(x[i]))
             for r in list(x[c]):
                 solutions.append(r)
                 # put the covered columns on the stack
                 cols = self.cover(x, y, r)
-                for s in self.recursive_solve(x, y, solutions):
-                    yield s
-                self.uncover(x, y, r, cols)
-                solutions.pop()
+                try:
+                    # yield from closes the deeper searches first, so a search closed early is uncovered in order
+                    yield from self.recursive_solve(x, y, solutions)
+                finally:
+                    self.uncover(x, y, r, cols)
+                    solutions.pop()
+
+    def _traced_recursive_solve(self,
+                                x: Dict[Tuple[str, Tuple[int, int]], set],
+                                y: Dict[Tuple[str, str], List[Tuple[str, Tuple[int, int]]]],
+                                solutions: List[Tuple[str, str]]) -> Union[List[Tuple[str, str]], None]:
+        """ Counts a DLX search node at its depth, then searches it with recursive_solve.
+
+        Args:
+            x: The DLX nodes
+            y: The DLX row headers
+            solutions: Buffer for solutions
+
+        Returns:
+            Solutions from deeper recursion
+        """
+        self.tracer.count_node(len(solutions), self.trace)
+        return DlxPuzzleSolver.recursive_solve(self, x, y, solutions)
 
     @staticmethod
     def cover(x: Dict[Tuple[str, Tuple[int, int]], set],
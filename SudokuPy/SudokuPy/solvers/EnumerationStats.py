@@ -0,0 +1,56 @@
+import sys
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def peak_rss() -> Optional[int]:
+    """Finds the peak resident set size of this process.
+
+    This is the highest RSS the process has ever reached, not just during the last enumeration, so in a
+    long running process it may come from earlier work. Compare it before and after an enumeration, or
+    enumerate in a fresh process, to see the memory the enumeration itself needed.
+
+    Returns:
+        The peak RSS in bytes, or None where the platform can't report it.
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, but kilobytes elsewhere
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+class EnumerationStats:
+    """The results of streaming every solution of a puzzle.
+
+    Attributes:
+        count (int): the number of solutions found.
+        seconds (float): the time taken to find and write the solutions.
+        peak_rss (int): the peak resident set size of the process in bytes, or None if unknown. This is the
+            peak over the life of the process (see peak_rss()), not only during the enumeration.
+    """
+    def __init__(self, count: int, seconds: float, peak_rss_bytes: Optional[int]):
+        """Initializer.
+
+        Args:
+            count: the number of solutions found.
+            seconds: the time taken to find and write the solutions.
+            peak_rss_bytes: the peak resident set size of the process in bytes, or None if unknown.
+        """
+        self.count = count
+        self.seconds = seconds
+        self.peak_rss = peak_rss_bytes
+
+    @property
+    def solutions_per_second(self) -> float:
+        """The rate solutions were found and written."""
+        return self.count / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self):
+        rss = f'{self.peak_rss / (1024 * 1024):.1f} MiB' if self.peak_rss is not None else 'unknown'
+        return (f'{self.count:d} solutions in {self.seconds:.2f} secs'
+                f' ({self.solutions_per_second:.2f} Hz), peak RSS {rss}')
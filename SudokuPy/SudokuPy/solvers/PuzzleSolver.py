@@ -1,5 +1,5 @@
 from abc import ABCMeta, abstractmethod
-from typing import Any, List
+from typing import Any, Dict, List, Optional, Set
 from SudokuPy.Puzzle import Puzzle, cross
 
 
@@ -17,23 +17,32 @@ class PuzzleSolver(metaclass=ABCMeta):
     """
     unit_list: List[List[str]]
 
-    def __init__(self, p: Puzzle):
+    def __init__(self,
+                 p: Puzzle,
+                 unit_list: Optional[List[List[str]]] = None,
+                 units: Optional[Dict[str, List[List[str]]]] = None,
+                 peers: Optional[Dict[str, Set[str]]] = None):
         """Initializer.
 
         Sets all the attributes of the class.
 
         Args:
             p (Puzzle): the Puzzle to be solved.
+            unit_list: every unit that must hold all of the digits, the rows, columns and boxes if None.
+            units: the units of each square, worked out from unit_list if None.
+            peers: the peers of each square, worked out from units if None.
         """
         super().__init__()
 
         self.puzzle = p
-        self.unit_list = ([cross(self.puzzle.rows, [c]) for c in self.puzzle.cols]
-                          + [cross([r], self.puzzle.cols) for r in self.puzzle.rows]
-                          + [cross(rs, cs) for rs in (['r1', 'r2', 'r3'], ['r4', 'r5', 'r6'], ['r7', 'r8', 'r9'])
-                             for cs in (['c1', 'c2', 'c3'], ['c4', 'c5', 'c6'], ['c7', 'c8', 'c9'])])
-        self.units = dict((s, [u for u in self.unit_list if s in u]) for s in self.puzzle.squares)
-        self.peers = dict((s, set(sum(self.units[s], [])) - {s}) for s in self.puzzle.squares)
+        if unit_list is None:
+            unit_list = ([cross(self.puzzle.rows, [c]) for c in self.puzzle.cols]
+                         + [cross([r], self.puzzle.cols) for r in self.puzzle.rows]
+                         + [cross(rs, cs) for rs in (['r1', 'r2', 'r3'], ['r4', 'r5', 'r6'], ['r7', 'r8', 'r9'])
+                            for cs in (['c1', 'c2', 'c3'], ['c4', 'c5', 'c6'], ['c7', 'c8', 'c9'])])
+        self.unit_list = unit_list
+        self.units = units or dict((s, [u for u in self.unit_list if s in u]) for s in self.puzzle.squares)
+        self.peers = peers or dict((s, set(sum(self.units[s], [])) - {s}) for s in self.puzzle.squares)
 
     @abstractmethod
     def solve(self):
@@ -0,0 +1,224 @@
+from typing import List
+
+from SudokuPy.Puzzle import Puzzle
+from SudokuPy.solvers.ConstraintModel import (_compile, ConstraintModel, diagonal_model, jigsaw_model,
+                                              standard_model, windoku_model)
+from SudokuPy.solvers.DlxPuzzleSolver import DlxPuzzleSolver
+import time
+
+
+def solve_all(definitions, model: ConstraintModel, name=''):
+    """Solve multiple puzzle definitions of a sudoku variant.
+
+    Args:
+        definitions: The puzzle definitions to solve
+        model: The sudoku variant of the puzzles
+        name: A friendly name to print as part of the report
+
+    Returns:
+        The number of puzzles solved
+    """
+    # Attempt to solve a sequence of grids. Report results.
+
+    times, results = zip(*[time_solve(definition, model) for definition in definitions])
+    n = len(results)
+    solved = results.count(True)
+    failed = results.count(False)
+
+    avg_time = sum(times) / n
+    freq = 1 / avg_time
+    print('\n')
+    print(f'Solved  - {solved :d} solutions of {n:d} {name} {model.name}'
+          f' (({failed} failed) puzzles (avg {avg_time :.4f} secs'
+          f' ({freq:.2f} Hz), max {max(times):.4f} secs).')
+    return solved
+
+
+def time_solve(definition, model: ConstraintModel):
+    """
+    Loads and solves a single variant puzzle, recording the time required.
+    Args:
+        definition: The puzzle to solve.
+        model: The sudoku variant of the puzzle.
+
+    Returns:
+        The time to solve and true if successful, false otherwise.
+    """
+    p = Puzzle()
+    p.load_puzzle(definition)
+
+    start = time.perf_counter()
+
+    s = DlxPuzzleSolver(p, model)
+    values = [solution for solution in s.solve()]
+
+    t = time.perf_counter() - start
+
+    return t, is_solved(p.digits, model.unit_list, values)
+
+
+def is_solved(all_puzzle_values: str, unit_list: List[List[str]], values):
+    """
+    Verifies a set of values is the only solution to the puzzle.
+    Args:
+        all_puzzle_values: the possible choices for a puzzle square
+        unit_list: a list of units of the variant
+        values: the solutions to test
+
+    Returns:
+        true if solves, false otherwise
+    """
+    all_values = set(all_puzzle_values)
+
+    return len(values) == 1 and all(set(values[0].grid[s] for s in unit) == all_values for unit in unit_list)
+
+
+standard_puzzles = [
+    '003020600900305001001806400008102900700000008006708200002609500800203009005010300',
+    '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......',
+    '.......1......2..3...4...........5..4.16.......71......5....2......8..4..3.91....',
+]
+
+diagonal_puzzles = [
+    '5.......1...4..7..........4.....5.............8..9.4...4.7....69..2.....8.3......',
+    '....5.....289.......6......5.3..1.8....7......62.......89........5....32......9..',
+    '83......2.......5..5.....6...6...9......4......7..6................1.4.8..32..1..',
+]
+
+windoku_puzzles = [
+    '3..6...........7.2..4.....8.....2....5.................8.4..6.1.73......5........',
+    '....8..7..78........69..2..5....7......4..........1...6.5.......27....9..........',
+    '.7......9.......3..9....6..2.71..4.............45.6....1.............548..94.....',
+]
+
+jigsaw_layout = [
+    '111122333',
+    '142225363',
+    '142225363',
+    '144525363',
+    '114555666',
+    '444455996',
+    '777799996',
+    '788888896',
+    '777788899',
+]
+
+jigsaw_puzzles = [
+    '...1.6..8..3.8..6..9.......2.4.....................9..4.1....8.......7.4........5',
+    '..6...................21....9.6..........4....3...74.8......67....3...5.......1..',
+]
+
+
+def test_standard_model_columns():
+    compiled = standard_model().compile()
+    assert len(compiled.rows) == 9 * 9 * 9
+    assert len(compiled.columns) == 4 * 9 * 9
+    assert not compiled.secondary
+    assert compiled.rows[('r3c2', '7')] == (('cell', (3, 2)), ('row', (3, 7)), ('column', (2, 7)), ('box', (1, 7)))
+
+
+def test_variant_model_columns():
+    assert len(diagonal_model().compile().columns) == 4 * 9 * 9 + 2 * 9
+    assert len(windoku_model().compile().columns) == 4 * 9 * 9 + 4 * 9
+    assert len(jigsaw_model(jigsaw_layout).compile().columns) == 4 * 9 * 9
+
+    assert ('diagonal', (2, 5)) in diagonal_model().compile().rows[('r1c9', '5')]
+    assert ('window', (4, 5)) in windoku_model().compile().rows[('r8c8', '5')]
+
+
+def test_compiled_model_is_cached():
+    assert standard_model().compile() is standard_model().compile()
+    assert diagonal_model().compile() is diagonal_model().compile()
+    assert jigsaw_model(jigsaw_layout).compile() is jigsaw_model(''.join(jigsaw_layout)).compile()
+    assert standard_model().compile() is not diagonal_model().compile()
+
+
+def test_solver_copies_compiled_columns():
+    compiled = standard_model().compile()
+    p = Puzzle()
+    p.load_puzzle(standard_puzzles[0])
+    solver = DlxPuzzleSolver(p)
+    assert solver.y is compiled.rows
+    assert len(solver.x) < len(compiled.columns)
+    assert all(len(rows) == 9 for rows in compiled.columns.values())
+
+
+def test_compiled_rows_are_frozen():
+    rows = diagonal_model().compile().rows
+    try:
+        rows[('r1c1', '1')] = ()
+        assert False
+    except TypeError:
+        pass
+    assert isinstance(rows[('r1c1', '1')], tuple)
+
+
+def test_variant_units_are_shared():
+    compiled = diagonal_model().compile()
+    solvers = [DlxPuzzleSolver(Puzzle(), diagonal_model()) for _ in range(2)]
+    assert all(solver.unit_list is compiled.unit_list for solver in solvers)
+    assert all(solver.units is compiled.units and solver.peers is compiled.peers for solver in solvers)
+
+
+def test_invalid_jigsaw_layout():
+    try:
+        jigsaw_model('1' * 80 + '2')
+        assert False
+    except ValueError:
+        pass
+
+
+def test_secondary_regions():
+    # a standard sudoku where squares a knight's move apart in the top left box may hold a digit at most once
+    knights = [['r1c1', 'r2c3'], ['r1c1', 'r3c2'], ['r1c3', 'r3c2'], ['r1c3', 'r2c1']]
+    base = standard_model()
+    model = ConstraintModel('knights', 9, base.regions, [('knight', knights)])
+    compiled = model.compile()
+    assert len(compiled.secondary) == len(knights) * 9
+    assert model.unit_list == base.unit_list
+
+    p = Puzzle()
+    p.load_puzzle('.' * 81)
+    solver = DlxPuzzleSolver(p, model)
+    solution = next(solver.solve())
+    assert all(solution.grid[a] != solution.grid[b] for a, b in knights)
+    assert is_solved(p.digits, model.unit_list, [solution])
+
+
+def test_solver_units_from_model():
+    p = Puzzle()
+    solver = DlxPuzzleSolver(p, jigsaw_model(jigsaw_layout))
+    assert len(solver.unit_list) == 27
+    assert ['r1c1', 'r1c2', 'r1c3', 'r2c1', 'r2c2', 'r2c3', 'r3c1', 'r3c2', 'r3c3'] not in solver.unit_list
+    assert solver.units['r1c1'][2] == ['r1c1', 'r1c2', 'r1c3', 'r1c4', 'r2c1', 'r3c1', 'r4c1', 'r5c1', 'r5c2']
+
+    solver = DlxPuzzleSolver(p, diagonal_model())
+    assert len(solver.unit_list) == 29
+    assert len(solver.units['r5c5']) == 5
+    # the diagonals share four squares with the centre box
+    assert len(solver.peers['r5c5']) == 20 + 8 + 8 - 4
+    assert len(solver.units['r1c2']) == 3
+
+
+def test_compiled_model_cache_is_bounded():
+    base = standard_model()
+    pairs = [[f'r1c{c}', f'r2c{c + 1}'] for c in range(1, 9)]
+    for n in range(_compile.cache_info().maxsize + 1):
+        ConstraintModel('pairs', 9, base.regions, [('pair', pairs[:n % 8 + 1] * (n // 8 + 1))]).compile()
+    assert _compile.cache_info().currsize <= _compile.cache_info().maxsize
+
+
+def test_solve_standard():
+    assert solve_all(standard_puzzles, standard_model(), "benchmark") == len(standard_puzzles)
+
+
+def test_solve_diagonal():
+    assert solve_all(diagonal_puzzles, diagonal_model(), "benchmark") == len(diagonal_puzzles)
+
+
+def test_solve_windoku():
+    assert solve_all(windoku_puzzles, windoku_model(), "benchmark") == len(windoku_puzzles)
+
+
+def test_solve_jigsaw():
+    assert solve_all(jigsaw_puzzles, jigsaw_model(jigsaw_layout), "benchmark") == len(jigsaw_puzzles)
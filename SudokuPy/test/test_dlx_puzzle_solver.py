@@ -1,3 +1,4 @@
+import io
 from typing import List
 
 from SudokuPy.Puzzle import Puzzle
@@ -95,6 +96,9 @@ hard1 = '.......1......2..3...4...........5..4.16.......71......5....2......8..4
 
 invalid1 = '.....6....59.....82....8....45........3........6..3.54...325..6..................'
 
+# grid1's solution with the top band removed, which has 168 solutions
+band1 = '...........................548132976729564138136798245372689514814253769695417382'
+
 
 def test_puzzle_solver_init():
     puzzle = Puzzle()
@@ -151,3 +155,100 @@ def test_solve_hardest():
     with open('sudoku-hardest.txt') as f:
         hardest_puzzles = [line.rstrip('\n') for line in f]
         solve_all(hardest_puzzles, "hardest")
+
+
+def enumerate_all(definition, **kwargs):
+    """
+    Streams all the solutions of a puzzle to memory, reporting the rate found.
+    Args:
+        definition: The puzzle to solve.
+        kwargs: Options for enumerate_solutions.
+
+    Returns:
+        The puzzle, the enumeration stats and the records written.
+    """
+    p = Puzzle()
+    p.load_puzzle(definition)
+
+    f = io.BytesIO()
+    stats = DlxPuzzleSolver(p).enumerate_solutions(f, **kwargs)
+    print('\n')
+    print(f'Enumerated - {stats}')
+
+    return p, stats, f.getvalue().splitlines()
+
+
+def test_enumerate_grid1():
+    p, stats, records = enumerate_all(grid1)
+    assert stats.count == 1
+    assert records == [b'483921657967345821251876493548132976729564138136798245372689514814253769695417382']
+
+
+def test_enumerate_band1():
+    p, stats, records = enumerate_all(band1)
+    assert stats.count == len(records) == len(set(records)) == 168
+    solver = DlxPuzzleSolver(p)
+    for record in records:
+        assert len(record) == 81
+        assert record[27:] == band1[27:].encode()
+        assert all(set(record[p.squares.index(s)] for s in unit) == set(p.digits.encode()) for unit in solver.unit_list)
+
+
+def test_enumerate_band1_diff():
+    p, stats, records = enumerate_all(band1, diff=True)
+    _, _, full_records = enumerate_all(band1)
+    assert stats.count == 168
+    assert records == [record[:27] for record in full_records]
+
+
+def test_enumerate_batches():
+    p = Puzzle()
+    p.load_puzzle(band1)
+    batches = []
+    stats = DlxPuzzleSolver(p).enumerate_solutions(batches.append, batch_size=50)
+    assert stats.count == 168
+    assert [len(batch) for batch in batches] == [50, 50, 50, 18]
+
+
+def test_enumerate_limit():
+    p, stats, records = enumerate_all(invalid1, limit=1000, batch_size=64)
+    assert stats.count == len(records) == len(set(records)) == 1000
+    assert stats.solutions_per_second > 0
+
+
+def test_enumerate_limit_zero():
+    p, stats, records = enumerate_all(band1, limit=0)
+    assert stats.count == 0
+    assert records == []
+
+
+def test_enumerate_peak_rss():
+    p, stats, records = enumerate_all(band1)
+    assert stats.peak_rss is None or (isinstance(stats.peak_rss, int) and stats.peak_rss > 0)
+
+
+def test_enumerate_text_file():
+    p = Puzzle()
+    p.load_puzzle(band1)
+    try:
+        DlxPuzzleSolver(p).enumerate_solutions(io.StringIO())
+        assert False
+    except TypeError:
+        pass
+
+
+def test_solver_reuse_after_early_stop():
+    p = Puzzle()
+    p.load_puzzle(band1)
+    s = DlxPuzzleSolver(p)
+    columns = len(s.x)
+
+    solutions = s.solve()
+    next(solutions)
+    solutions.close()
+    assert len(s.x) == columns
+    assert s.enumerate_solutions(io.BytesIO(), limit=10).count == 10
+    assert len(s.x) == columns
+    assert s.enumerate_solutions(io.BytesIO()).count == 168
+    assert len([solution for solution in s.solve()]) == 2
+    assert len(s.x) == columns
@@ -0,0 +1,173 @@
+import io
+import json
+
+from SudokuPy.Puzzle import Puzzle
+from SudokuPy.solvers.DlxPuzzleSolver import DlxPuzzleSolver
+from SudokuPy.Tracer import Tracer
+
+
+def trace_all(definitions, tracer: Tracer, name=''):
+    """Solve multiple puzzle definitions, tracing each one.
+
+    Args:
+        definitions: The puzzle definitions to solve
+        tracer: The tracer to record the phases of each solve
+        name: A friendly name to print as part of the report
+    """
+    for i, definition in enumerate(definitions, 1):
+        with tracer.puzzle(f'{name} {i}'):
+            p = Puzzle()
+            with tracer.span('parse'):
+                p.load_puzzle(definition)
+
+            s = DlxPuzzleSolver(p, tracer=tracer)
+            values = [solution for solution in s.solve()]
+            assert len(values) == 1
+
+    summary = tracer.summary()
+    print('\n')
+    for phase, stats in summary['phases'].items():
+        print(f'Traced  - {phase} of {stats["count"]:d} {name} puzzles'
+              f' (avg {stats["mean"] * 1000:.3f} ms, max {stats["max"] * 1000:.3f} ms).')
+
+
+grid1 = '003020600900305001001806400008102900700000008006708200002609500800203009005010300'
+grid2 = '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......'
+
+
+def test_trace_phases():
+    tracer = Tracer()
+    trace_all([grid1, grid2], tracer, 'grids')
+
+    assert [trace.name for trace in tracer.puzzles] == ['grids 1', 'grids 2']
+    for trace in tracer.puzzles:
+        phases = [phase for phase, _, _ in trace.spans]
+        assert phases[:3] == ['parse', 'build', 'givens']
+        assert {'search', 'materialize'} <= set(phases)
+        assert all(trace.start <= start and duration >= 0 for _, start, duration in trace.spans)
+        assert trace.duration >= sum(duration for _, _, duration in trace.spans)
+
+    summary = tracer.summary()
+    assert summary['puzzles'] == 2
+    assert set(summary['phases']) == {'parse', 'build', 'givens', 'search', 'materialize'}
+    assert all(stats['count'] == 2 for stats in summary['phases'].values())
+
+
+def test_trace_depths():
+    tracer = Tracer()
+    trace_all([grid1], tracer, 'grid1')
+
+    # grid1 needs no guesses, so there is a single search node at each depth down to the solution
+    depths = tracer.puzzles[0].depths
+    blanks = grid1.count('0')
+    assert dict(depths) == {d: 1 for d in range(blanks + 1)}
+    assert tracer.summary()['depths'] == dict(depths)
+
+
+def test_chrome_trace():
+    tracer = Tracer()
+    trace_all([grid1, grid2], tracer, 'grids')
+
+    f = io.StringIO()
+    tracer.write_chrome_trace(f)
+    trace = json.loads(f.getvalue())
+
+    events = trace['traceEvents']
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+    assert [event['name'] for event in events if event['cat'] == 'puzzle'] == ['grids 1', 'grids 2']
+    assert {event['name'] for event in events if event['cat'] == 'phase'} == set(trace['otherData']['phases'])
+    assert events[0]['args']['nodes'] == grid1.count('0') + 1
+    assert trace['otherData']['puzzles'] == 2
+
+
+def test_trace_without_puzzle():
+    tracer = Tracer()
+    for definition in (grid1, grid2, grid1):
+        p = Puzzle()
+        p.load_puzzle(definition)
+        s = DlxPuzzleSolver(p, tracer=tracer)
+        assert len([solution for solution in s.solve()]) == 1
+
+    summary = tracer.summary()
+    assert summary['puzzles'] == 3
+    assert all(summary['phases'][phase]['count'] == 3 for phase in ('build', 'givens', 'search', 'materialize'))
+    assert [trace.name for trace in tracer.puzzles] == ['puzzle 1', 'puzzle 2', 'puzzle 3']
+    assert dict(tracer.puzzles[0].depths) == dict(tracer.puzzles[2].depths)
+    assert all(trace.duration > 0 for trace in tracer.puzzles)
+
+
+def test_trace_solvers_built_before_solving():
+    tracer = Tracer()
+    solvers = []
+    for definition in (grid1, grid2):
+        p = Puzzle()
+        p.load_puzzle(definition)
+        solvers.append(DlxPuzzleSolver(p, tracer=tracer))
+    for s in solvers:
+        assert len([solution for solution in s.solve()]) == 1
+
+    for s, trace in zip(solvers, tracer.puzzles):
+        assert s.trace is trace
+        phases = [phase for phase, _, _ in trace.spans]
+        assert phases[:2] == ['build', 'givens']
+        assert {'search', 'materialize'} <= set(phases)
+    assert dict(tracer.puzzles[0].depths) == {d: 1 for d in range(grid1.count('0') + 1)}
+    assert sum(tracer.puzzles[1].depths.values()) > grid2.count('.') + 1
+
+
+def test_trace_solve_after_puzzle():
+    tracer = Tracer()
+    with tracer.puzzle('grid1'):
+        p = Puzzle()
+        with tracer.span('parse'):
+            p.load_puzzle(grid1)
+        s = DlxPuzzleSolver(p, tracer=tracer)
+    solutions = s.solve()
+
+    assert len([solution for solution in solutions]) == 1
+    trace = tracer.puzzles[0]
+    assert len(tracer.puzzles) == 1
+    assert [phase for phase, _, _ in trace.spans][:3] == ['parse', 'build', 'givens']
+    assert 'search' in [phase for phase, _, _ in trace.spans]
+    assert sum(trace.depths.values()) == grid1.count('0') + 1
+    assert trace.duration >= sum(duration for _, _, duration in trace.spans)
+
+
+def test_trace_span_without_puzzle():
+    tracer = Tracer()
+    try:
+        with tracer.span('parse'):
+            pass
+        assert False
+    except RuntimeError:
+        pass
+
+
+def test_trace_enumeration():
+    tracer = Tracer()
+    with tracer.puzzle('band1'):
+        p = Puzzle()
+        p.load_puzzle('.' * 27 + '548132976729564138136798245372689514814253769695417382')
+        stats = DlxPuzzleSolver(p, tracer=tracer).enumerate_solutions(io.BytesIO())
+
+    assert stats.count == 168
+    phases = [phase for phase, _, _ in tracer.puzzles[0].spans]
+    assert phases == ['build', 'givens', 'search']
+    assert tracer.puzzles[0].depths[0] == 1
+
+
+def test_untraced_solver():
+    p = Puzzle()
+    p.load_puzzle(grid2)
+    s = DlxPuzzleSolver(p)
+    assert s.tracer is None
+    assert 'recursive_solve' not in vars(s)
+    assert len([solution for solution in s.solve()]) == 1
+
+
+def test_trace_hard():
+    with open('sudoku-top95.txt') as f:
+        hard_puzzles = [line.rstrip('\n') for line in f]
+        tracer = Tracer()
+        trace_all(hard_puzzles, tracer, "hard")
+        assert tracer.summary()['puzzles'] == len(hard_puzzles)